@@ -2,18 +2,19 @@
 from __future__ import annotations
 
 import asyncio
-import json
 import os
 import time
 import uuid
-from typing import Dict, List, Optional
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional
 
 import orjson
-import yaml
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse, HTMLResponse, PlainTextResponse, StreamingResponse
-from pydantic import BaseModel, Field
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import FileResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, Field, PrivateAttr
 
 # import scanner core from sibling package
 import sys
@@ -21,10 +22,17 @@ sys.path.append(os.path.join(os.path.dirname(__file__), "..", "core"))
 import wvscanner_core as core  # noqa: E402
 
 API_TITLE = "Mini-OWASP API"
+MAX_TRACKED_SCANS = 1024
+SSE_HEARTBEAT_SECONDS = 15
 FRONTEND_ORIGINS = ["http://localhost:5173", "http://127.0.0.1:5173"]
 
 REPORT_DIR = os.path.join(os.path.dirname(__file__), "..", "core", "reports")
 os.makedirs(REPORT_DIR, exist_ok=True)
+DEFAULT_CONFIG = os.path.join(os.path.dirname(__file__), "..", "core", "config.yaml")
+
+# Parsed DEFAULT_CONFIG, re-read only when the file's mtime changes
+_DEFAULT_CFG: Optional[dict] = None
+_DEFAULT_CFG_MTIME: Optional[float] = None
 
 class ScanStatus(BaseModel):
     scan_id: str
@@ -40,11 +48,61 @@ class ScanStatus(BaseModel):
     json_path: str | None = None
     html_path: str | None = None
     events: List[str] = Field(default_factory=list)
+    # set whenever a new event is emitted; wakes SSE subscribers
+    _notify: asyncio.Event = PrivateAttr(default_factory=asyncio.Event)
+
+class ScanRegistry:
+    """
+    Bounded in-memory scan registry guarded by an asyncio.Lock.
+    Once above max_items, finished/errored scans are evicted least-recently-used
+    first; running scans are never evicted.
+    """
+    def __init__(self, max_items: int = MAX_TRACKED_SCANS):
+        self.max_items = max_items
+        self._items: OrderedDict[str, ScanStatus] = OrderedDict()
+        self._lock = asyncio.Lock()
+
+    async def get(self, scan_id: str) -> Optional[ScanStatus]:
+        async with self._lock:
+            st = self._items.get(scan_id)
+            if st is not None:
+                self._items.move_to_end(scan_id)
+            return st
+
+    async def set(self, scan_id: str, st: ScanStatus) -> None:
+        async with self._lock:
+            self._items[scan_id] = st
+            self._items.move_to_end(scan_id)
+            self._evict()
 
-RUNS: Dict[str, ScanStatus] = {}
-LOCK = asyncio.Lock()
+    def _evict(self) -> None:
+        excess = len(self._items) - self.max_items
+        if excess <= 0:
+            return
+        done = [sid for sid, st in self._items.items() if st.state in ("finished", "error")]
+        for sid in done[:excess]:
+            del self._items[sid]
 
-app = FastAPI(title=API_TITLE)
+RUNS = ScanRegistry()
+
+# Caps how many scans run at once; extra requests wait in "queued" state
+MAX_CONCURRENT_SCANS = max(1, int(os.environ.get("MAX_CONCURRENT_SCANS", "2")))
+SCAN_SEM = asyncio.BoundedSemaphore(MAX_CONCURRENT_SCANS)
+# Scans are blocking (httpx + sync Playwright); run them off the event loop.
+# One worker per running scan plus spares so config loads and report saves
+# never wait behind a scan.
+EXECUTOR = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_SCANS + 2, thread_name_prefix="scan")
+
+class ReportGZipMiddleware(GZipMiddleware):
+    """GZip responses (reports are very compressible) but leave SSE streams alone."""
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].endswith("/stream"):
+            await self.app(scope, receive, send)
+            return
+        await super().__call__(scope, receive, send)
+
+app = FastAPI(title=API_TITLE, default_response_class=ORJSONResponse)
+app.add_middleware(ReportGZipMiddleware, minimum_size=1024)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=FRONTEND_ORIGINS,
@@ -55,46 +113,65 @@ app.add_middleware(
 
 class ScanRequest(BaseModel):
     url: str
-    config_path: str = os.path.join(os.path.dirname(__file__), "..", "core", "config.yaml")
+    config_path: Optional[str] = None   # defaults to DEFAULT_CONFIG
     details: bool = True
 
 def _progress_emit(st: ScanStatus, msg: str):
     st.events.append(f"[{time.strftime('%H:%M:%S')}] {msg}")
     if len(st.events) > 500:
         st.events = st.events[-500:]
+    st._notify.set()
+
+def _get_default_cfg() -> dict:
+    global _DEFAULT_CFG, _DEFAULT_CFG_MTIME
+    mtime = os.path.getmtime(DEFAULT_CONFIG)
+    if _DEFAULT_CFG is None or mtime != _DEFAULT_CFG_MTIME:
+        _DEFAULT_CFG = core.load_config_cached(DEFAULT_CONFIG)
+        _DEFAULT_CFG_MTIME = mtime
+    return _DEFAULT_CFG
+
+def _load_scan_config(config_path: Optional[str]) -> dict:
+    if not config_path:
+        return _get_default_cfg()
+    # client-supplied path: parse it directly, never read or write a pickle sidecar
+    return core.load_config(config_path)
 
 async def _run_scan_async(scan_id: str, req: ScanRequest):
-    async with LOCK:
-        st = RUNS.get(scan_id)
+    st = await RUNS.get(scan_id)
     if not st:
         return
-    _progress_emit(st, f"Starting scan for {req.url}")
-    try:
-        with open(req.config_path, "r", encoding="utf-8") as f:
-            cfg = yaml.safe_load(f) or {}
-        _progress_emit(st, "Config loaded.")
-
-        _progress_emit(st, "Initializing scanner...")
-        result = core.run_scan(req.url, cfg)
-
-        st.pages = result.crawled_pages
-        st.forms = result.discovered_forms
-        st.findings = len(result.findings)
-
-        json_path, html_path = core.save_report(result, cfg.get("report", {}).get("out", "reports"), cfg.get("report", {}))
-        st.json_path = json_path
-        st.html_path = html_path
-
-        _progress_emit(st, f"Reports saved: {json_path} | {html_path}")
-        st.progress = 100
-        st.state = "finished"
-        st.finished_at = time.time()
-        _progress_emit(st, "Scan finished.")
-    except Exception as e:
-        st.state = "error"
-        st.message = f"{type(e).__name__}: {e}"
-        st.finished_at = time.time()
-        _progress_emit(st, f"Scan failed: {st.message}")
+    st.message = "queued"
+    async with SCAN_SEM:
+        st.message = ""
+        _progress_emit(st, f"Starting scan for {req.url}")
+        loop = asyncio.get_running_loop()
+        try:
+            cfg = await loop.run_in_executor(EXECUTOR, _load_scan_config, req.config_path)
+            _progress_emit(st, "Config loaded.")
+
+            _progress_emit(st, "Initializing scanner...")
+            result = await loop.run_in_executor(EXECUTOR, core.run_scan, req.url, cfg)
+
+            st.pages = result.crawled_pages
+            st.forms = result.discovered_forms
+            st.findings = len(result.findings)
+
+            json_path, html_path = await loop.run_in_executor(
+                EXECUTOR, core.save_report, result, cfg.get("report", {}).get("out", "reports"), cfg.get("report", {})
+            )
+            st.json_path = json_path
+            st.html_path = html_path
+
+            _progress_emit(st, f"Reports saved: {json_path} | {html_path}")
+            st.progress = 100
+            st.state = "finished"
+            st.finished_at = time.time()
+            _progress_emit(st, "Scan finished.")
+        except Exception as e:
+            st.state = "error"
+            st.message = f"{type(e).__name__}: {e}"
+            st.finished_at = time.time()
+            _progress_emit(st, f"Scan failed: {st.message}")
 
 @app.get("/healthz")
 def healthz():
@@ -112,60 +189,72 @@ async def start_scan(req: ScanRequest, bg: BackgroundTasks):
         state="running",
         progress=5,
     )
-    RUNS[scan_id] = st
+    await RUNS.set(scan_id, st)
     bg.add_task(_run_scan_async, scan_id, req)
     return {"scan_id": scan_id}
 
 @app.get("/scan/{scan_id}/status")
 async def scan_status(scan_id: str):
-    st = RUNS.get(scan_id)
+    st = await RUNS.get(scan_id)
     if not st:
         raise HTTPException(status_code=404, detail="scan not found")
-    return JSONResponse(st.model_dump(), dumps=orjson.dumps)
+    return st.model_dump()
 
 @app.get("/scan/{scan_id}/stream")
 async def scan_stream(scan_id: str):
-    st = RUNS.get(scan_id)
+    st = await RUNS.get(scan_id)
     if not st:
         raise HTTPException(status_code=404, detail="scan not found")
 
     async def event_gen():
         last = 0
-        yield f"event: status\ndata: {json.dumps(st.model_dump())}\n\n"
+        yield f"event: status\ndata: {orjson.dumps(st.model_dump()).decode()}\n\n"
         while True:
-            await asyncio.sleep(0.7)
+            if len(st.events) == last:
+                try:
+                    await asyncio.wait_for(st._notify.wait(), timeout=SSE_HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    pass  # heartbeat: re-send status so proxies keep the stream open
+            st._notify.clear()
             cur = len(st.events)
             if cur != last:
                 for i in range(last, cur):
-                    yield f"event: log\ndata: {json.dumps(st.events[i])}\n\n"
+                    yield f"event: log\ndata: {orjson.dumps(st.events[i]).decode()}\n\n"
                 last = cur
-            yield f"event: status\ndata: {json.dumps({'state': st.state, 'progress': st.progress, 'pages': st.pages, 'forms': st.forms, 'findings': st.findings})}\n\n"
+            status_payload = orjson.dumps({
+                "state": st.state,
+                "progress": st.progress,
+                "pages": st.pages,
+                "forms": st.forms,
+                "findings": st.findings,
+            }).decode()
+            yield f"event: status\ndata: {status_payload}\n\n"
             if st.state in ("finished", "error"):
                 break
 
     headers = {"Cache-Control": "no-cache", "Content-Type": "text/event-stream", "Connection": "keep-alive"}
     return StreamingResponse(event_gen(), headers=headers)
 
-def _read_text(path: Optional[str]) -> str:
-    if not path or not os.path.exists(path):
+def _report_file(path: str, media_type: str) -> FileResponse:
+    # One stat serves both the 404 check and FileResponse's size/mtime headers
+    try:
+        stat_result = os.stat(path)
+    except FileNotFoundError:
         raise HTTPException(status_code=404, detail="report not found")
-    with open(path, "r", encoding="utf-8") as f:
-        return f.read()
+    return FileResponse(path, media_type=media_type, stat_result=stat_result)
 
 @app.get("/scan/{scan_id}/report.json")
 async def report_json(scan_id: str):
-    st = RUNS.get(scan_id)
+    st = await RUNS.get(scan_id)
     if not st or not st.json_path:
         raise HTTPException(status_code=404, detail="json report not found (maybe still running?)")
-    txt = _read_text(st.json_path)
-    return PlainTextResponse(txt, media_type="application/json")
+    return _report_file(st.json_path, "application/json")
 
 @app.get("/scan/{scan_id}/report.html")
 async def report_html(scan_id: str):
-    st = RUNS.get(scan_id)
+    st = await RUNS.get(scan_id)
     if not st or not st.html_path:
         raise HTTPException(status_code=404, detail="html report not found (maybe still running?)")
-    txt = _read_text(st.html_path)
-    return HTMLResponse(txt)
+    return _report_file(st.html_path, "text/html")
 
 # Run: uvicorn api_server:app --host 0.0.0.0 --port 8000 --reload
@@ -11,19 +11,19 @@ Mini OWASP Web Scanner — CLI (v1.3, JS-aware)
 """
 
 import argparse
+import asyncio
 import logging
 import sys
-from collections import defaultdict
-from typing import Dict, List, Tuple, Any
+from collections import Counter, defaultdict
+from typing import Dict, List, Optional, Tuple, Any
 import urllib.parse as urlparse
 
-import yaml  # PyYAML
 from colorama import Fore, Style, init as colorama_init
 
-from wvscanner_core import run_scan, save_report, summary_text
+from wvscanner_core import add_page_forms, js_page_forms, load_config_cached, run_scan, save_report, summary_text
 
 try:
-    from js_renderer import js_context, render_url
+    from js_renderer import async_js_context, render_page_async
     JS_AVAILABLE = True
 except Exception:
     JS_AVAILABLE = False
@@ -37,11 +37,24 @@ logging.basicConfig(
 )
 log = logging.getLogger("wvscanner_cli")
 
+# Sort order for findings (lower = more severe)
+SEV_RANK = {"HIGH": 0, "MEDIUM": 1, "LOW": 2, "INFO": 3}
+SEV_COLOR = {"HIGH": Fore.RED, "MEDIUM": Fore.YELLOW, "LOW": Fore.CYAN, "INFO": Fore.CYAN}
+
+def _sev_rank(severity: str) -> int:
+    return SEV_RANK.get(severity, 9)
+
+def _finding_sort_key(f) -> Tuple[int, str]:
+    return _sev_rank(f.severity), f.url
+
+def _category_sort_key(item) -> Tuple[int, str]:
+    # (category, findings) -> most findings first, then by name
+    return -len(item[1]), item[0]
+
 
 def load_config(path: str) -> dict:
     try:
-        with open(path, "r", encoding="utf-8") as f:
-            cfg = yaml.safe_load(f) or {}
+        cfg = load_config_cached(path)
         log.info("Loaded config from %s", path)
         return cfg
     except Exception as e:
@@ -49,6 +62,8 @@ def load_config(path: str) -> dict:
         sys.exit(1)
 
 def norm_url(u: str) -> str:
+    if u.startswith(("http://", "https://")):
+        return u
     try:
         p = urlparse.urlsplit(u)
         if not p.scheme:
@@ -58,17 +73,11 @@ def norm_url(u: str) -> str:
         return u
 
 def unique_preserve_order(items: List[str]) -> List[str]:
-    seen = set()
-    out = []
-    for x in items:
-        if x not in seen:
-            seen.add(x)
-            out.append(x)
-    return out
+    return list(dict.fromkeys(items))
 
-def js_discovery_pass(base_url: str,
-                      routes: List[str],
-                      js_cfg: Dict) -> Tuple[List[str], Dict[str, List[Dict[str, Any]]]]:
+async def js_discovery_pass_async(base_url: str,
+                                  routes: List[str],
+                                  js_cfg: Dict) -> Tuple[List[str], Dict[str, List[Dict[str, Any]]]]:
     if not JS_AVAILABLE:
         log.warning("Playwright is not available; skipping --js-discovery pass.")
         return [], {}
@@ -77,6 +86,7 @@ def js_discovery_pass(base_url: str,
     nav_timeout_ms = int(js_cfg.get("nav_timeout_ms", 12000))
     run_timeout_ms = int(js_cfg.get("run_timeout_ms", 4000))
     max_body_chars = int(js_cfg.get("max_body_chars", 200000))
+    concurrency = max(1, int(js_cfg.get("concurrency", 4)))
 
     targets = [base_url]
     for r in routes:
@@ -87,101 +97,128 @@ def js_discovery_pass(base_url: str,
 
     pages: List[str] = []
     forms: Dict[str, List[Dict[str, Any]]] = {}
+    sem = asyncio.Semaphore(concurrency)
 
-    try:
-        with js_context(headless=headless) as browser:
-            for t in targets:
+    async def _render(context, t: str):
+        async with sem:
+            try:
+                page = await context.new_page()
                 try:
-                    res = render_url(browser, t, nav_timeout_ms, run_timeout_ms, max_body_chars)
-                    pages.append(t)
-                    if res.forms:
-                        forms[t] = res.forms
-                    log.debug("[js-discovery] %s -> forms=%d", t, len(res.forms or []))
-                except Exception as e:
-                    log.debug("[js-discovery] error for %s: %s", t, e.__class__.__name__)
-                    continue
+                    return await render_page_async(page, t, nav_timeout_ms, run_timeout_ms, max_body_chars)
+                finally:
+                    await page.close()
+            except Exception as e:
+                log.debug("[js-discovery] error for %s: %s", t, e.__class__.__name__)
+                return None
+
+    try:
+        async with async_js_context(headless=headless) as browser:
+            context = await browser.new_context()
+            try:
+                results = await asyncio.gather(*(_render(context, t) for t in targets))
+            finally:
+                await context.close()
     except Exception as e:
         log.warning("Playwright could not start for discovery: %s", e.__class__.__name__)
+        return [], {}
+
+    for t, res in zip(targets, results):
+        if res is None:
+            continue
+        pages.append(t)
+        if res.forms:
+            forms[t] = res.forms
+        log.debug("[js-discovery] %s -> forms=%d", t, len(res.forms or []))
 
     return unique_preserve_order(pages), forms
 
-def print_colored_summary(result):
-    high = [f for f in result.findings if f.severity == "HIGH"]
-    med = [f for f in result.findings if f.severity == "MEDIUM"]
-    info = [f for f in result.findings if f.severity in ("LOW", "INFO")]
+def js_discovery_pass(base_url: str,
+                      routes: List[str],
+                      js_cfg: Dict) -> Tuple[List[str], Dict[str, List[Dict[str, Any]]]]:
+    return asyncio.run(js_discovery_pass_async(base_url, routes, js_cfg))
+
+FindingGroups = Tuple[Dict[str, List[Any]], Counter]
+
+def group_findings(findings) -> FindingGroups:
+    """Single pass over findings -> (by_category, severity counts)."""
+    by_cat = defaultdict(list)
+    sev: Counter = Counter()
+    for f in findings:
+        by_cat[f.category].append(f)
+        sev[f.severity] += 1
+    return by_cat, sev
+
+def print_colored_summary(result, groups: Optional[FindingGroups] = None):
+    by_cat, sev = groups or group_findings(result.findings)
 
     print()
     print(Fore.CYAN + f"=== Scan Summary for {result.target} ===" + Style.RESET_ALL)
     print(f"Pages crawled: {Fore.YELLOW}{result.crawled_pages}{Style.RESET_ALL} | Forms: {Fore.YELLOW}{result.discovered_forms}{Style.RESET_ALL}")
-    print(f"{Fore.RED}HIGH:{Style.RESET_ALL} {len(high)}  {Fore.YELLOW}MEDIUM:{Style.RESET_ALL} {len(med)}  {Fore.BLUE}INFO:{Style.RESET_ALL} {len(info)}")
+    print(f"{Fore.RED}HIGH:{Style.RESET_ALL} {sev['HIGH']}  {Fore.YELLOW}MEDIUM:{Style.RESET_ALL} {sev['MEDIUM']}  {Fore.BLUE}INFO:{Style.RESET_ALL} {sev['LOW'] + sev['INFO']}")
     print()
 
-    by_cat = defaultdict(list)
-    for f in result.findings:
-        by_cat[f.category].append(f)
-
     if not result.findings:
         print(Fore.GREEN + "No findings — nice! 😄" + Style.RESET_ALL)
         return
 
     print(Fore.MAGENTA + "Findings by category:" + Style.RESET_ALL)
-    for cat, items in sorted(by_cat.items(), key=lambda x: (-len(x[1]), x[0])):
-        color = Fore.YELLOW if any(i.severity == "MEDIUM" for i in items) else Fore.RED if any(i.severity == "HIGH" for i in items) else Fore.CYAN
+    for cat, items in sorted(by_cat.items(), key=_category_sort_key):
+        color = SEV_COLOR.get(min((i.severity for i in items), key=_sev_rank), Fore.CYAN)
         print(f"  {color}{cat}{Style.RESET_ALL}: {len(items)}")
     print()
 
-def print_detailed(result, max_show_per_cat=20, extra_pages=None, extra_forms=None):
-    print(Fore.BLUE + "Crawled pages (top):" + Style.RESET_ALL)
-    for p in result.pages[:50]:
-        print("  -", p)
+def _append_forms(lines: List[str], forms_by_page: Dict[str, List[Dict[str, Any]]]) -> None:
+    for page, forms in forms_by_page.items():
+        lines.append(f"  {page} -> {len(forms)} form(s)\n")
+        for fi, form in enumerate(forms, start=1):
+            inputs = ", ".join(form['inputs']) if form.get('inputs') else "(no inputs)"
+            lines.append(f"    [{fi}] {form.get('method','get').upper()} {form.get('action')}   inputs: {inputs}\n")
+
+def print_detailed(result, max_show_per_cat=20, extra_pages=None, extra_forms=None,
+                   groups: Optional[FindingGroups] = None):
+    # Build the whole block and write it once; large scans print thousands of lines
+    lines: List[str] = []
+    lines.append(Fore.BLUE + "Crawled pages (top):" + Style.RESET_ALL + "\n")
+    lines.extend(f"  - {p}\n" for p in result.pages[:50])
     if len(result.pages) > 50:
-        print(f"  ... ({len(result.pages) - 50} more pages)")
-    print()
+        lines.append(f"  ... ({len(result.pages) - 50} more pages)\n")
+    lines.append("\n")
 
     if extra_pages:
-        print(Fore.BLUE + "JS-discovery pages (not part of vuln modules yet):" + Style.RESET_ALL)
-        for p in extra_pages[:50]:
-            print("  +", p)
+        lines.append(Fore.BLUE + "JS-discovery pages (not part of vuln modules yet):" + Style.RESET_ALL + "\n")
+        lines.extend(f"  + {p}\n" for p in extra_pages[:50])
         if len(extra_pages) > 50:
-            print(f"  ... ({len(extra_pages) - 50} more JS-discovery pages)")
-        print()
+            lines.append(f"  ... ({len(extra_pages) - 50} more JS-discovery pages)\n")
+        lines.append("\n")
 
-    print(Fore.BLUE + "Forms discovered (page -> inputs):" + Style.RESET_ALL)
+    lines.append(Fore.BLUE + "Forms discovered (page -> inputs):" + Style.RESET_ALL + "\n")
     if not result.forms:
-        print("  (no HTML/GET forms discovered by crawler)")
+        lines.append("  (no HTML/GET forms discovered by crawler)\n")
     else:
-        for page, forms in result.forms.items():
-            print(f"  {page} -> {len(forms)} form(s)")
-            for fi, form in enumerate(forms, start=1):
-                inputs = ", ".join(form.get('inputs', {}).keys()) if form.get('inputs') else "(no inputs)"
-                print(f"    [{fi}] {form.get('method','get').upper()} {form.get('action')}   inputs: {inputs}")
-    print()
+        _append_forms(lines, result.forms)
+    lines.append("\n")
 
     if extra_forms:
-        print(Fore.BLUE + "JS-discovery forms (Angular/SPA):" + Style.RESET_ALL)
-        for page, forms in extra_forms.items():
-            print(f"  {page} -> {len(forms)} form(s)")
-            for fi, form in enumerate(forms, start=1):
-                inputs = ", ".join(form.get('inputs', {}).keys()) if form.get('inputs') else "(no inputs)"
-                print(f"    [{fi}] {form.get('method','get').upper()} {form.get('action')}   inputs: {inputs}")
-        print()
-
-    if not result.findings:
-        return
-    by_cat = defaultdict(list)
-    for f in result.findings:
-        by_cat[f.category].append(f)
-    for cat in sorted(by_cat.keys()):
-        items = by_cat[cat]
-        print(Fore.MAGENTA + f"--- {cat} ({len(items)}) ---" + Style.RESET_ALL)
-        items_sorted = sorted(items, key=lambda x: ("0" if x.severity=="HIGH" else "1" if x.severity=="MEDIUM" else "2", x.url))
-        for idx, f in enumerate(items_sorted[:max_show_per_cat], start=1):
-            sev_color = Fore.RED if f.severity == "HIGH" else (Fore.YELLOW if f.severity == "MEDIUM" else Fore.CYAN)
-            print(f" {sev_color}[{f.severity}]{Style.RESET_ALL} {f.url}  param={Fore.GREEN}{f.param}{Style.RESET_ALL}")
-            print(f"    evidence: {f.evidence}")
-        if len(items) > max_show_per_cat:
-            print(f"    ... ({len(items) - max_show_per_cat} more findings in category {cat})")
-        print()
+        lines.append(Fore.BLUE + "JS-discovery forms (Angular/SPA):" + Style.RESET_ALL + "\n")
+        _append_forms(lines, extra_forms)
+        lines.append("\n")
+
+    if result.findings:
+        by_cat = (groups or group_findings(result.findings))[0]
+        for cat in sorted(by_cat.keys()):
+            items = by_cat[cat]
+            lines.append(Fore.MAGENTA + f"--- {cat} ({len(items)}) ---" + Style.RESET_ALL + "\n")
+            items_sorted = sorted(items, key=_finding_sort_key)
+            for f in items_sorted[:max_show_per_cat]:
+                sev_color = SEV_COLOR.get(f.severity, Fore.CYAN)
+                lines.append(f" {sev_color}[{f.severity}]{Style.RESET_ALL} {f.url}  param={Fore.GREEN}{f.param}{Style.RESET_ALL}\n")
+                lines.append(f"    evidence: {f.evidence}\n")
+            if len(items) > max_show_per_cat:
+                lines.append(f"    ... ({len(items) - max_show_per_cat} more findings in category {cat})\n")
+            lines.append("\n")
+
+    sys.stdout.write("".join(lines))
+    sys.stdout.flush()
 
 def parse_args():
     ap = argparse.ArgumentParser(description="Mini OWASP Web Vulnerability Scanner (CLI)")
@@ -240,21 +277,19 @@ def main():
             res.pages = unique_preserve_order(res.pages + extra_pages)
             res.crawled_pages = len(res.pages)
 
-            # Merge forms (append to any existing per-page lists)
+            # Merge forms through the crawler's signature dedup: forms it already
+            # recorded only gain the SPA route in form_pages
             for page, forms_list in extra_forms.items():
-                if not forms_list:
-                    continue
-                if page not in res.forms:
-                    res.forms[page] = []
-                res.forms[page].extend(forms_list)
+                add_page_forms(res.forms, res.form_pages, page, js_page_forms(forms_list, page))
 
             # Recompute discovered_forms
             res.discovered_forms = sum(len(v) for v in res.forms.values())
 
     # Print summary + optional details
-    print_colored_summary(res)
+    groups = group_findings(res.findings)
+    print_colored_summary(res, groups)
     if args.details:
-        print_detailed(res, max_show_per_cat=25, extra_pages=extra_pages, extra_forms=extra_forms)
+        print_detailed(res, max_show_per_cat=25, extra_pages=extra_pages, extra_forms=extra_forms, groups=groups)
 
     # Save reports (now include merged forms/pages)
     json_path, html_path = save_report(res, args.out, cfg.get("report", {}))
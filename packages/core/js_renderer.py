@@ -1,9 +1,10 @@
 # js_renderer.py
 from dataclasses import dataclass
 from typing import List, Dict, Any
-from contextlib import contextmanager
+from contextlib import asynccontextmanager, contextmanager
 
-from playwright.sync_api import sync_playwright, Browser
+from playwright.sync_api import sync_playwright, Browser, Page
+from playwright.async_api import async_playwright, Browser as AsyncBrowser, Page as AsyncPage
 
 @dataclass
 class JSResult:
@@ -18,56 +19,66 @@ class JSResult:
 @contextmanager
 def js_context(headless: bool = True):
     pw = sync_playwright().start()
-    browser = pw.chromium.launch(
-        headless=headless,
-        args=["--no-sandbox", "--disable-dev-shm-usage"]
-    )
     try:
-        yield browser
-    finally:
+        browser = pw.chromium.launch(
+            headless=headless,
+            args=["--no-sandbox", "--disable-dev-shm-usage"]
+        )
         try:
-            browser.close()
-        except Exception:
-            pass
+            yield browser
+        finally:
+            try:
+                browser.close()
+            except Exception:
+                pass
+    finally:
         pw.stop()
 
+@asynccontextmanager
+async def async_js_context(headless: bool = True):
+    """Async counterpart of js_context() for concurrent rendering."""
+    pw = await async_playwright().start()
+    try:
+        browser: AsyncBrowser = await pw.chromium.launch(
+            headless=headless,
+            args=["--no-sandbox", "--disable-dev-shm-usage"]
+        )
+        try:
+            yield browser
+        finally:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+    finally:
+        await pw.stop()
+
 # RAW triple-quoted JS to avoid Python escaping issues
 _JS_COLLECTOR: str = r"""
-(() => {
+(maxBodyChars) => {
   const abs = (u) => {
     try { return new URL(u, location.href).href; } catch(e) { return null; }
   };
 
-  // 1) Classic anchors
-  const hrefs = Array.from(document.querySelectorAll('a[href]'))
-    .map(a => a.getAttribute('href'))
-    .filter(Boolean);
-
-  // 2) SPA routes: routerLink / ng-reflect-router-link (Angular)
-  const routerLinks = Array.from(document.querySelectorAll('[routerLink], [ng-reflect-router-link]'))
-    .flatMap(el => {
-      let v = el.getAttribute('routerLink') || el.getAttribute('ng-reflect-router-link') || "";
-      if (Array.isArray(v)) v = v.join('');
-      if (typeof v !== 'string') v = String(v || '');
-      return [v];
-    })
-    .filter(Boolean);
-
-  // 3) Hash links (e.g., "#/search")
-  const hashHrefs = Array.from(document.querySelectorAll('a[href^="#"]'))
-    .map(a => a.getAttribute('href'))
-    .filter(Boolean);
-
-  // Resolve to absolute URLs
+  // Links: anchors, SPA routes (routerLink / ng-reflect-router-link) and hash
+  // links (e.g., "#/search") are collected in a single DOM walk
   const linkSet = new Set();
-  for (const h of hrefs) {
-    const u = abs(h);
-    if (u) linkSet.add(u);
-  }
-  for (const r of routerLinks) {
+  const base = location.href.split('#')[0];
+  for (const el of document.querySelectorAll('a[href], [routerLink], [ng-reflect-router-link]')) {
+    const h = el.localName === 'a' ? el.getAttribute('href') : null;
+    if (h) {
+      if (h.startsWith('#')) {
+        linkSet.add(base + h);
+      } else {
+        const u = abs(h);
+        if (u) linkSet.add(u);
+      }
+    }
+
+    const r = String(el.getAttribute('routerLink') || el.getAttribute('ng-reflect-router-link') || '');
+    if (!r) continue;
     let u = r;
     if (r.startsWith('#')) {
-      const base = location.href.split('#')[0];
       u = base + r;
     } else {
       const absu = abs(r);
@@ -80,10 +91,6 @@ _JS_COLLECTOR: str = r"""
     }
     if (u) linkSet.add(u);
   }
-  for (const hh of hashHrefs) {
-    const base = location.href.split('#')[0];
-    linkSet.add(base + hh);
-  }
 
   // --------------------------
   // Forms (Angular-friendly)
@@ -138,8 +145,9 @@ _JS_COLLECTOR: str = r"""
   // Collect <form>…<input>… plus a pseudo-form fallback when page uses reactive forms without <form>
   const outForms = [];
 
-  // Real forms
-  Array.from(document.querySelectorAll('form')).forEach(f => {
+  // Real forms (document.forms is a live collection; no extra tree walk)
+  const docForms = document.forms;
+  Array.from(docForms).forEach(f => {
     const action = f.getAttribute('action') || location.href;
     const method = (f.getAttribute('method') || 'get').toLowerCase();
     const inputs = {};
@@ -154,7 +162,7 @@ _JS_COLLECTOR: str = r"""
   });
 
   // Pseudo-form if there was no <form> tag but the page shows input controls
-  if (outForms.length === 0) {
+  if (docForms.length === 0) {
     const inputs = {};
     const els = document.querySelectorAll('input, textarea, select');
     let idx = 0;
@@ -175,28 +183,32 @@ _JS_COLLECTOR: str = r"""
     }
   }
 
-  return { links: Array.from(linkSet), forms: outForms };
-})()
+  // Serialize + truncate the DOM in-browser so only one payload crosses the bridge
+  const html = document.documentElement ? document.documentElement.outerHTML.slice(0, maxBodyChars) : '';
+
+  return { links: Array.from(linkSet), forms: outForms, html };
+}
 """
 
-def _collect_dom(page) -> Dict[str, Any]:
+def _collect_dom(page, max_body_chars: int) -> Dict[str, Any]:
     """
     Execute the JS collector inside the page:
       - Anchors and SPA router links (absolute)
       - Forms with Angular-friendly input discovery
       - Pseudo-form if no <form> present but inputs exist
+      - Rendered HTML, truncated to max_body_chars
     """
-    return page.evaluate(_JS_COLLECTOR)
+    return page.evaluate(_JS_COLLECTOR, max_body_chars)
 
-def render_url(browser: Browser, url: str, nav_timeout_ms: int, run_timeout_ms: int, max_body_chars: int) -> JSResult:
-    page = browser.new_page()
+def render_page(page: Page, url: str, nav_timeout_ms: int, run_timeout_ms: int, max_body_chars: int) -> JSResult:
+    """Render `url` on an already-open page; the page stays open for reuse."""
     console_logs: List[str] = []
     dialogs: List[str] = []
     timed_out = False
 
     def on_console(msg):
         try:
-            console_logs.append(msg.text())
+            console_logs.append(msg.text)
         except Exception:
             pass
 
@@ -218,24 +230,89 @@ def render_url(browser: Browser, url: str, nav_timeout_ms: int, run_timeout_ms:
         page.goto(url, wait_until="load")
         page.wait_for_load_state("networkidle", timeout=nav_timeout_ms)
         page.wait_for_timeout(run_timeout_ms)
-        html = page.content()
-        info = _collect_dom(page)
+        info = _collect_dom(page, max_body_chars)
+        html = info.get("html") or ""
         links = info.get("links") or []
         forms = info.get("forms") or []
     except Exception:
         timed_out = True
         try:
-            html = page.content()
+            html = page.content()[:max_body_chars]
         except Exception:
             html = ""
+    finally:
+        try:
+            page.remove_listener("console", on_console)
+            page.remove_listener("dialog", on_dialog)
+        except Exception:
+            pass
+
+    return JSResult(
+        url=url,
+        html=html,
+        console_messages=console_logs,
+        dialogs=dialogs,
+        timed_out=timed_out,
+        links=links,
+        forms=forms,
+    )
+
+def render_url(browser: Browser, url: str, nav_timeout_ms: int, run_timeout_ms: int, max_body_chars: int) -> JSResult:
+    page = browser.new_page()
+    try:
+        return render_page(page, url, nav_timeout_ms, run_timeout_ms, max_body_chars)
     finally:
         try:
             page.close()
         except Exception:
             pass
 
-    if len(html) > max_body_chars:
-        html = html[:max_body_chars]
+async def render_page_async(page: AsyncPage, url: str, nav_timeout_ms: int, run_timeout_ms: int, max_body_chars: int) -> JSResult:
+    """Async counterpart of render_page()."""
+    console_logs: List[str] = []
+    dialogs: List[str] = []
+    timed_out = False
+
+    def on_console(msg):
+        try:
+            console_logs.append(msg.text)
+        except Exception:
+            pass
+
+    async def on_dialog(dialog):
+        try:
+            dialogs.append(dialog.message)
+            await dialog.dismiss()
+        except Exception:
+            pass
+
+    page.on("console", on_console)
+    page.on("dialog", on_dialog)
+
+    links: List[str] = []
+    forms: List[Dict[str, Any]] = []
+    try:
+        page.set_default_navigation_timeout(nav_timeout_ms)
+        await page.goto(url, wait_until="load")
+        await page.wait_for_load_state("networkidle", timeout=nav_timeout_ms)
+        await page.wait_for_timeout(run_timeout_ms)
+        info = await page.evaluate(_JS_COLLECTOR, max_body_chars)
+        html = info.get("html") or ""
+        links = info.get("links") or []
+        forms = info.get("forms") or []
+    except Exception:
+        timed_out = True
+        try:
+            html = (await page.content())[:max_body_chars]
+        except Exception:
+            html = ""
+    finally:
+        try:
+            page.remove_listener("console", on_console)
+            page.remove_listener("dialog", on_dialog)
+        except Exception:
+            pass
+
     return JSResult(
         url=url,
         html=html,
@@ -1,29 +1,38 @@
+from itertools import chain
 from pathlib import Path
-from typing import List, Dict
+from typing import Dict, List, Tuple
 from .interface import PayloadProvider
 
+# (path, st_mtime_ns) -> filtered lines; module-level so the API's scans, each
+# with its own provider, share wordlists that have not changed on disk
+_FILE_CACHE: Dict[Tuple[str, int], Tuple[str, ...]] = {}
+
+def _read_payload_file(path: str) -> Tuple[str, ...]:
+    p = Path(path)
+    try:
+        key = (str(p.resolve()), p.stat().st_mtime_ns)
+    except OSError:
+        return ()
+    lines = _FILE_CACHE.get(key)
+    if lines is None:
+        try:
+            text = p.read_text(encoding="utf-8", errors="ignore")
+        except OSError:
+            return ()
+        lines = tuple(s for s in map(str.strip, text.splitlines()) if s and s[0] != "#")
+        for stale in [k for k in _FILE_CACHE if k[0] == key[0]]:
+            _FILE_CACHE.pop(stale, None)
+        _FILE_CACHE[key] = lines
+    return lines
+
 class StaticPayloadProvider(PayloadProvider):
     """Reads payloads from config and external text files (xss_files/sqli_files)."""
     def __init__(self, payload_cfg: Dict):
         self.cfg = payload_cfg or {}
 
     def _read_files(self, file_list: List[str]) -> List[str]:
-        out: List[str] = []
-        for f in file_list or []:
-            p = Path(f)
-            if not p.exists():
-                continue
-            with open(p, "r", encoding="utf-8", errors="ignore") as fh:
-                for line in fh:
-                    s = line.strip()
-                    if s and not s.startswith("#"):
-                        out.append(s)
         # dedupe preserving order
-        seen = set(); dedup = []
-        for x in out:
-            if x not in seen:
-                seen.add(x); dedup.append(x)
-        return dedup
+        return list(dict.fromkeys(chain.from_iterable(map(_read_payload_file, file_list or []))))
 
     def get_xss_payloads(self, context: Dict) -> List[str]:
         inline = list(self.cfg.get("xss_reflected", []) or [])
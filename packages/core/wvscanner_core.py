@@ -14,34 +14,55 @@ NOTE: Use only on assets you own or have explicit permission to test.
 from __future__ import annotations
 
 import os
+import re
 import time
-import json
+import asyncio
 import html
-import queue
+import hashlib
+import ipaddress
+import pickle
 import logging
-from dataclasses import dataclass, asdict
-from typing import Dict, List, Optional, Set, Tuple, Any
+import threading
+from collections import Counter
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import AsyncExitStack, ExitStack
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Set, Tuple, Any
 import urllib.parse as urlparse
+import urllib.request as urlrequest
 
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util import Retry
-from bs4 import BeautifulSoup, XMLParsedAsHTMLWarning
-import warnings
+import yaml  # PyYAML
+import httpx
+import orjson
+import lxml.html
+from lxml import etree
 
 # Providers (new)
 from payloads.providers.static_provider import StaticPayloadProvider
 from payloads.providers.ai_provider_stub import AIPayloadProvider
 
-warnings.filterwarnings("ignore", category=XMLParsedAsHTMLWarning)
+try:
+    from yaml import CSafeLoader as SafeLoader  # libyaml-backed, much faster
+except ImportError:
+    from yaml import SafeLoader
 
 log = logging.getLogger("wvscanner_core")
 
+_UTF8_HTML_PARSER = lxml.html.HTMLParser(encoding="utf-8")
+
+# DB error signatures for error-based SQLi, matched in a single regex pass
+_SQLI_ERROR_RE = re.compile(
+    r"you have an error in your sql syntax|warning: mysql|unclosed quotation mark"
+    r"|pg_query\(\):|mysql_fetch_array\(\)|sqlstate\[|sqlite_error",
+    re.IGNORECASE,
+)
+
 
 # -------------------------
 # Data models
 # -------------------------
-@dataclass
+@dataclass(slots=True)
 class Finding:
     severity: str
     category: str
@@ -59,6 +80,49 @@ class ScanResult:
     findings: List[Finding]
     started_at: float
     finished_at: float
+    # form signature -> pages the form was seen on; each unique form is listed
+    # in `forms` only under the first of those pages
+    form_pages: Dict[str, List[str]] = field(default_factory=dict)
+
+
+# -------------------------
+# Config loading
+# -------------------------
+def load_config(path: str) -> Dict:
+    """Parse a YAML config file."""
+    with open(path, "r", encoding="utf-8") as f:
+        return yaml.load(f, Loader=SafeLoader) or {}
+
+def load_config_cached(path: str) -> Dict:
+    """
+    Parse a trusted YAML config, reusing a pickled sidecar (`<path>.pkl`) while
+    the YAML's (mtime_ns, size) matches the stamp stored in it. An exact match
+    rather than "newer than" catches files replaced with an older mtime
+    (cp -p, tar, rsync -a). Failing to write the sidecar is not fatal.
+
+    Only use this for configs the operator controls: the sidecar is unpickled.
+    """
+    cache = path + ".pkl"
+    st = os.stat(path)
+    stamp = (st.st_mtime_ns, st.st_size)
+    try:
+        with open(cache, "rb") as f:
+            cached_stamp, cfg = pickle.load(f)
+        if cached_stamp == stamp:
+            return cfg
+    except (OSError, EOFError, ValueError, TypeError, pickle.UnpicklingError):
+        pass
+
+    cfg = load_config(path)
+
+    tmp = f"{cache}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        with open(tmp, "wb") as f:
+            pickle.dump((stamp, cfg), f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache)
+    except OSError as e:
+        log.debug("Could not write config cache %s: %s", cache, e.__class__.__name__)
+    return cfg
 
 
 # -------------------------
@@ -95,13 +159,12 @@ def host_in_allowed(host: str, allowed_hosts: List[str]) -> bool:
             return True
     return False
 
+_MULTISLASH_RE = re.compile(r"/+")
+
 def normalize_slash_path(path: str) -> str:
     if not path:
         return "/"
-    norm = "/" + path.lstrip("/")
-    while "//" in norm:
-        norm = norm.replace("//", "/")
-    return norm
+    return _MULTISLASH_RE.sub("/", "/" + path.lstrip("/"))
 
 def canonicalize_spa(u: str, start_origin: str, start_path: str) -> str:
     """Make hash-routes look like canonical paths under the app's base path."""
@@ -117,11 +180,52 @@ def canonicalize_spa(u: str, start_origin: str, start_path: str) -> str:
             return urlparse.urlunsplit((p.scheme, p.netloc, base_path, "", frag))
     return urlparse.urlunsplit((p.scheme, p.netloc, path, p.query, frag))
 
+_DEFAULT_PORTS = {"http": "80", "https": "443"}
+
+@lru_cache(maxsize=8192)
 def canonical_key(u: str) -> str:
+    """
+    SURT-like dedup key: lowercase scheme/host, default port dropped, slashes
+    collapsed, query params sorted. Only SPA route fragments ("#/...") are kept;
+    in-page anchors ("#top") map to the page itself.
+    """
     p = urlparse.urlsplit(u)
+    scheme = p.scheme.lower()
+    netloc = p.netloc.lower()
+    host, sep, port = netloc.rpartition(":")
+    if sep and _DEFAULT_PORTS.get(scheme) == port:
+        netloc = host
     path = normalize_slash_path(p.path)
-    frag = p.fragment or ""
-    return urlparse.urlunsplit((p.scheme, p.netloc, path, p.query, frag))
+    query = urlparse.urlencode(sorted(urlparse.parse_qsl(p.query, keep_blank_values=True)))
+    frag = p.fragment if p.fragment.startswith("/") else ""
+    return urlparse.urlunsplit((scheme, netloc, path, query, frag))
+
+EncodedPayload = Tuple[str, str]  # (raw payload, quote_plus-encoded payload)
+
+def encode_payloads(payloads: Sequence[str]) -> Tuple[EncodedPayload, ...]:
+    """URL-encode each payload once per scan instead of once per (url, param)."""
+    return tuple((p, urlparse.quote_plus(p)) for p in payloads)
+
+def _param_url_builder(url: str, param: str) -> Callable[[str], Tuple[str, str]]:
+    """
+    Split and encode `url`'s query once around `param`; the returned function
+    takes an already-encoded value and yields (url_with_fragment, url_to_fetch).
+    """
+    parsed = urlparse.urlsplit(url)
+    items = list(dict(urlparse.parse_qsl(parsed.query, keep_blank_values=True)).items())
+    keys = [k for k, _ in items]
+    idx = keys.index(param) if param in keys else len(items)
+    head = urlparse.urlencode(items[:idx])
+    tail = urlparse.urlencode(items[idx + 1:])
+    prefix = f"{parsed.scheme}://{parsed.netloc}{parsed.path}?" + (head + "&" if head else "")
+    prefix += urlparse.quote_plus(param) + "="
+    tail = "&" + tail if tail else ""
+    suffix = f"#{parsed.fragment}" if parsed.fragment else ""
+
+    def build(encoded_value: str) -> Tuple[str, str]:
+        fetch_url = prefix + encoded_value + tail
+        return fetch_url + suffix, fetch_url
+    return build
 
 def should_skip(href: str, excludes_paths: List[str], exclude_domains: List[str]) -> bool:
     try:
@@ -133,32 +237,130 @@ def should_skip(href: str, excludes_paths: List[str], exclude_domains: List[str]
     href_l = (href or "").lower()
     return any(e in href_l for e in excludes_paths)
 
+class _RetryPolicy:
+    """
+    Retry on connection errors and 429/5xx responses with exponential backoff,
+    mirroring the urllib3 Retry policy the scanner used with requests.
+    """
+    RETRY_STATUSES = frozenset((429, 500, 502, 503, 504))
+    RETRY_METHODS = frozenset(("GET", "POST", "HEAD", "OPTIONS"))
+
+    def __init__(self, retries: int, backoff_factor: float):
+        self._retries = max(0, retries)
+        self._backoff_factor = backoff_factor
+
+    def _can_retry(self, request: httpx.Request, attempt: int) -> bool:
+        return request.method in self.RETRY_METHODS and attempt < self._retries
+
+    def _backoff(self, attempt: int) -> float:
+        # like urllib3, the first retry is immediate
+        return self._backoff_factor * (2 ** (attempt - 1)) if attempt > 1 else 0.0
+
+class _RetryTransport(_RetryPolicy, httpx.BaseTransport):
+    def __init__(self, inner: httpx.BaseTransport, retries: int, backoff_factor: float):
+        super().__init__(retries, backoff_factor)
+        self._inner = inner
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                resp = self._inner.handle_request(request)
+            except httpx.TransportError:
+                if not self._can_retry(request, attempt):
+                    raise
+            else:
+                if resp.status_code not in self.RETRY_STATUSES or not self._can_retry(request, attempt):
+                    return resp
+                resp.close()
+            attempt += 1
+            time.sleep(self._backoff(attempt))
+
+    def close(self) -> None:
+        self._inner.close()
+
+class _AsyncRetryTransport(_RetryPolicy, httpx.AsyncBaseTransport):
+    def __init__(self, inner: httpx.AsyncBaseTransport, retries: int, backoff_factor: float):
+        super().__init__(retries, backoff_factor)
+        self._inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            try:
+                resp = await self._inner.handle_async_request(request)
+            except httpx.TransportError:
+                if not self._can_retry(request, attempt):
+                    raise
+            else:
+                if resp.status_code not in self.RETRY_STATUSES or not self._can_retry(request, attempt):
+                    return resp
+                await resp.aclose()
+            attempt += 1
+            await asyncio.sleep(self._backoff(attempt))
+
+    async def aclose(self) -> None:
+        await self._inner.aclose()
+
+def _no_proxy_pattern(host: str) -> str:
+    """httpx mount pattern for one NO_PROXY entry."""
+    try:
+        ip = ipaddress.ip_address(host.strip("[]"))
+    except ValueError:
+        return f"all://{host}" if host.lower() == "localhost" else f"all://*{host}"
+    return f"all://[{ip}]" if ip.version == 6 else f"all://{ip}"
+
+def _proxy_mounts(proxies: Optional[Dict[str, str]], transport: Callable[..., Any]) -> Dict[str, Any]:
+    """
+    Map a requests-style {"http": url, "https": url} proxies dict to httpx mounts.
+    Passing our own transport turns off httpx's environment lookup, so without
+    explicit proxies HTTP(S)_PROXY / ALL_PROXY / NO_PROXY are honoured here,
+    as requests did.
+    """
+    no_proxy = ""
+    if not proxies:
+        env = urlrequest.getproxies()
+        no_proxy = env.get("no", "")
+        proxies = {k: v for k, v in env.items() if k in ("http", "https", "all")}
+    mounts: Dict[str, Any] = {f"{scheme}://": transport(proxy) for scheme, proxy in proxies.items() if proxy}
+    if mounts:
+        for host in filter(None, (h.strip().lstrip(".") for h in no_proxy.split(","))):
+            if host == "*":
+                return {}
+            mounts[_no_proxy_pattern(host)] = None  # None -> the client's direct transport
+    return mounts
+
 def make_session(user_agent: str,
                  follow_redirects: bool,
                  timeout: int,
                  verify_ssl: bool = True,
                  retries: int = 2,
-                 backoff_factor: float = 0.4) -> requests.Session:
-    s = requests.Session()
-    s.headers.update({"User-Agent": user_agent})
-    s.verify = verify_ssl
-    s.allow_redirects = follow_redirects
-    # custom attribute used by our code
-    s.request_timeout = timeout
-
-    retry = Retry(
-        total=retries,
-        connect=retries,
-        read=retries,
-        redirect=retries,
-        backoff_factor=backoff_factor,
-        status_forcelist=(429, 500, 502, 503, 504),
-        allowed_methods=frozenset(["GET", "POST", "HEAD", "OPTIONS"]),
-        raise_on_status=False,
+                 backoff_factor: float = 0.4,
+                 pool_maxsize: int = 10,
+                 proxies: Optional[Dict[str, str]] = None) -> httpx.Client:
+    """
+    HTTP/2-capable client with keep-alive pooling; concurrent probes against one
+    origin share its connections instead of opening one per request.
+    """
+    limits = httpx.Limits(max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize)
+
+    def transport(proxy: Optional[str] = None) -> httpx.BaseTransport:
+        inner = httpx.HTTPTransport(verify=verify_ssl, http2=True, limits=limits, proxy=proxy)
+        return _RetryTransport(inner, retries, backoff_factor)
+
+    s = httpx.Client(
+        headers={"User-Agent": user_agent},
+        follow_redirects=follow_redirects,
+        timeout=timeout,
+        transport=transport(),
+        mounts=_proxy_mounts(proxies, transport),
     )
-    adapter = HTTPAdapter(max_retries=retry, pool_connections=10, pool_maxsize=10)
-    s.mount("http://", adapter)
-    s.mount("https://", adapter)
+    # custom attributes used by our code
+    s.request_timeout = timeout
+    s.verify_ssl = verify_ssl
+    s.proxy_map = dict(proxies or {})
+    s.retries = retries
+    s.backoff_factor = backoff_factor
     return s
 
 
@@ -184,25 +386,135 @@ def _try_render_with_js(js_cfg: Dict, url: str):
 # -------------------------
 # JS-aware CRAWLER with SPA canonicalization
 # -------------------------
-def crawl(start_url: str,
-          session: requests.Session,
-          *,
-          max_depth: int,
-          same_host_only: bool,
-          excludes_paths: List[str],
-          exclude_domains: List[str],
-          follow_redirect_hosts: bool,
-          allowed_hosts: List[str],
-          max_pages: int,
-          delay_ms: int,
-          js_cfg: Optional[Dict] = None) -> Tuple[List[str], Dict[str, List[Dict[str, str]]]]:
+def _async_client(session: httpx.Client, limit: int) -> httpx.AsyncClient:
+    """
+    Build an httpx.AsyncClient mirroring the sync client's settings. It starts
+    from a copy of the session's cookies; merge them back once the crawl ends.
     """
+    limits = httpx.Limits(max_connections=limit, max_keepalive_connections=limit, keepalive_expiry=30)
+
+    def transport(proxy: Optional[str] = None) -> httpx.AsyncBaseTransport:
+        inner = httpx.AsyncHTTPTransport(verify=session.verify_ssl, http2=True, limits=limits, proxy=proxy)
+        return _AsyncRetryTransport(inner, session.retries, session.backoff_factor)
+
+    return httpx.AsyncClient(
+        headers=session.headers,
+        auth=session.auth,
+        cookies=session.cookies,
+        follow_redirects=True,
+        timeout=session.request_timeout,
+        transport=transport(),
+        mounts=_proxy_mounts(session.proxy_map, transport),
+    )
+
+def _form_signature(form: Dict[str, Any]) -> str:
+    """Stable id for a form: method, action and sorted input names."""
+    names = "|".join(sorted(map(str, form.get("inputs") or {})))
+    raw = f"{form.get('method') or 'get'}|{form.get('action') or ''}|{names}"
+    return hashlib.sha1(raw.encode("utf-8"), usedforsecurity=False).hexdigest()
+
+def js_page_forms(js_forms: List[Dict[str, Any]], page: str) -> List[Dict[str, Any]]:
+    """Normalize forms from the Playwright collector like static ones; input-less forms are dropped."""
+    out: List[Dict[str, Any]] = []
+    for jf in js_forms:
+        inputs = jf.get("inputs") or {}
+        if inputs:
+            out.append({"action": jf.get("action") or page, "method": (jf.get("method") or "get").lower(), "inputs": inputs})
+    return out
+
+def add_page_forms(forms: Dict[str, List[Dict[str, Any]]], form_pages: Dict[str, List[str]],
+                   page: str, page_forms: List[Dict[str, Any]]) -> None:
+    """
+    Record `page_forms` seen on `page`. Each form (by signature) is kept in
+    `forms` only under the first page it appeared on; `form_pages` lists them all.
+    """
+    for fm in page_forms:
+        sig = _form_signature(fm)
+        seen_on = form_pages.get(sig)
+        if seen_on is None:
+            form_pages[sig] = [page]
+            forms.setdefault(page, []).append(dict(fm, signature=sig))
+        elif page not in seen_on:
+            seen_on.append(page)
+
+def _parse_dom(dom_html: str, url: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """Extract static forms and link candidates from an HTML document in one tree walk."""
+    if not dom_html.strip():
+        return [], []
+    try:
+        tree = lxml.html.fromstring(dom_html)
+    except ValueError:
+        # str input with an XML encoding declaration; let lxml decode the bytes
+        tree = lxml.html.fromstring(dom_html.encode("utf-8"), parser=_UTF8_HTML_PARSER)
+    except etree.ParserError:
+        return [], []
+
+    page_forms: List[Dict[str, Any]] = []
+    link_candidates: List[str] = []
+    base = url.split("#", 1)[0]
+    for el in tree.iter(etree.Element):
+        tag = el.tag
+        if tag == "form":
+            method = (el.get("method") or "get").lower()
+            action = urlparse.urljoin(url, el.get("action") or url)
+            inputs = {}
+            for inp in el.iter("input", "textarea", "select"):
+                name = (inp.get("name")
+                        or inp.get("formcontrolname")
+                        or inp.get("ng-reflect-name")
+                        or inp.get("ng-reflect-form-control-name")
+                        or inp.get("aria-label")
+                        or inp.get("placeholder"))
+                if not name:
+                    continue
+                value = inp.get("value") or ""
+                if inp.tag == "select":
+                    opt = inp.find(".//option[@selected]")
+                    if opt is None:
+                        opt = inp.find(".//option")
+                    if opt is not None:
+                        value = opt.get("value") or opt.text_content()
+                inputs[str(name)] = value
+            if inputs:
+                page_forms.append({"action": action, "method": method, "inputs": inputs})
+
+        href = el.get("href")
+        if href:
+            if tag == "a":
+                link_candidates.append(urlparse.urljoin(url, href))
+            if href.startswith("#"):
+                link_candidates.append(base + href)
+
+    return page_forms, link_candidates
+
+async def crawl(start_url: str,
+                session: httpx.Client,
+                *,
+                max_depth: int,
+                same_host_only: bool,
+                excludes_paths: List[str],
+                exclude_domains: List[str],
+                follow_redirect_hosts: bool,
+                allowed_hosts: List[str],
+                max_pages: int,
+                delay_ms: int,
+                js_cfg: Optional[Dict] = None,
+                concurrency: int = 20) -> Tuple[List[str], Dict[str, List[Dict[str, Any]]],
+                                                Dict[str, Dict[str, str]], Dict[str, List[str]]]:
+    """
+    Breadth-first crawl with `concurrency` workers sharing an asyncio.Queue.
+
     Returns:
       pages: list of unique page URLs visited (canonicalized)
       forms: mapping URL -> list of forms (each: {action, method, inputs: dict})
+      headers: mapping effective (post-redirect) URL -> response headers of its fetch
+      form_pages: mapping form signature -> pages it appeared on; site-wide forms
+                  (search, login) are kept in `forms` only for the first page
     """
     pages: List[str] = []
-    forms: Dict[str, List[Dict[str, str]]] = {}
+    forms: Dict[str, List[Dict[str, Any]]] = {}
+    headers_map: Dict[str, Dict[str, str]] = {}
+    form_pages: Dict[str, List[str]] = {}
     visited_keys: Set[str] = set()
 
     start_url = norm_url(start_url)
@@ -211,73 +523,111 @@ def crawl(start_url: str,
     start_path = normalize_slash_path(start_split.path or "/")
     start_host = start_split.netloc.lower()
 
+    loop = asyncio.get_running_loop()
     use_js = bool(js_cfg and js_cfg.get("enabled", False))
 
-    js_browser_ctx = None
-    js_browser = None
+    # Async Playwright renders on this crawl's own event loop: up to
+    # javascript.concurrency pages at once in one browser context, and nothing
+    # shared with other crawls running in the same process.
+    js_stack = AsyncExitStack()
+    js_context = None
+    js_sem = asyncio.Semaphore(max(1, int((js_cfg or {}).get("concurrency", 4))))
     if use_js:
         try:
-            from js_renderer import js_context
-            js_browser_ctx = js_context(headless=bool(js_cfg.get("headless", True)))
-            js_browser = js_browser_ctx.__enter__()
+            from js_renderer import async_js_context
+            js_browser = await js_stack.enter_async_context(
+                async_js_context(headless=bool(js_cfg.get("headless", True)))
+            )
+            js_context = await js_browser.new_context()
+            js_stack.push_async_callback(js_context.close)
             log.debug("JS renderer (Playwright) initialized.")
         except Exception as e:
-            js_browser = None
-            js_browser_ctx = None
+            js_context = None
+            await js_stack.aclose()
             log.warning("Failed to initialize Playwright renderer: %s. Falling back to HTML-only crawl.", type(e).__name__)
 
-    q: queue.Queue = queue.Queue()
-    q.put((start_url, 0))
-
-    while not q.empty():
-        url, depth = q.get()
-        url = canonicalize_spa(url, start_origin, start_path)
-        key = canonical_key(url)
+    # nav bars and footers repeat the same hrefs on every page, so resolve
+    # raw URL -> (canonical URL, dedup key) in a single cached lookup
+    @lru_cache(maxsize=8192)
+    def canonicalize(u: str) -> Tuple[str, str]:
+        cu = canonicalize_spa(u, start_origin, start_path)
+        return cu, canonical_key(cu)
+
+    http = _async_client(session, limit=max(1, concurrency))
+
+    # delay_ms is a crawl-wide politeness gap between fetches, not per worker
+    throttle_lock = asyncio.Lock()
+    next_fetch_at = 0.0
+
+    async def throttle() -> None:
+        nonlocal next_fetch_at
+        if not delay_ms:
+            return
+        async with throttle_lock:
+            wait = next_fetch_at - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            next_fetch_at = loop.time() + delay_ms / 1000.0
+
+    async def visit(url: str, depth: int) -> None:
+        url, key = canonicalize(url)
         if key in visited_keys or depth > max_depth:
-            continue
+            return
+        if max_pages and len(pages) >= max_pages:
+            return
+        # claim before awaiting so no other worker fetches the same page
+        visited_keys.add(key)
 
+        fetch_url = strip_hash(url)
+        await throttle()
         try:
-            resp = session.get(strip_hash(url), timeout=session.request_timeout, allow_redirects=True)
-            effective_url = resp.url
-            raw_html = resp.text or ""
+            resp = await http.get(fetch_url)
+            effective_url = str(resp.url)
+            resp_headers = dict(resp.headers)
+            raw_html = resp.text
         except Exception as e:
+            visited_keys.discard(key)
             log.warning("Fetch failed for %s: %s", url, e.__class__.__name__)
-            continue
+            return
 
         requested_host = urlparse.urlsplit(url).netloc.lower()
         effective_host = urlparse.urlsplit(effective_url).netloc.lower()
         if effective_host != requested_host:
             if not follow_redirect_hosts:
-                visited_keys.add(key)
-                continue
-            else:
-                url = canonicalize_spa(effective_url, start_origin, start_path)
-                key = canonical_key(url)
+                return
+            url, key = canonicalize(effective_url)
+            if key in visited_keys:
+                return
+            visited_keys.add(key)
 
         this_host = urlparse.urlsplit(url).netloc.lower()
         if same_host_only and this_host != start_host:
-            visited_keys.add(key)
-            continue
+            return
         if not host_in_allowed(this_host, allowed_hosts):
-            visited_keys.add(key)
-            continue
+            return
 
-        visited_keys.add(key)
+        if max_pages and len(pages) >= max_pages:
+            return
         pages.append(url)
-
+        headers_map.setdefault(effective_url, resp_headers)
         if max_pages and len(pages) >= max_pages:
-            break
+            return
 
         rendered_html = None
         js_links: List[str] = []
         js_forms: List[Dict[str, str]] = []
-        if js_browser is not None:
+        if js_context is not None:
             try:
-                from js_renderer import render_url
+                from js_renderer import render_page_async
                 nav_timeout_ms = int(js_cfg.get("nav_timeout_ms", 12000))
                 run_timeout_ms = int(js_cfg.get("run_timeout_ms", 4000))
                 max_body_chars = int(js_cfg.get("max_body_chars", 200000))
-                result = render_url(js_browser, url, nav_timeout_ms, run_timeout_ms, max_body_chars)
+                async with js_sem:
+                    page = await js_context.new_page()
+                    try:
+                        result = await render_page_async(page, url, nav_timeout_ms, run_timeout_ms, max_body_chars)
+                    finally:
+                        await page.close()
                 rendered_html = result.html or ""
                 js_links = result.links or []
                 js_forms = result.forms or []
@@ -285,62 +635,19 @@ def crawl(start_url: str,
                 rendered_html = None
 
         dom_html = rendered_html if rendered_html else raw_html
-        soup = BeautifulSoup(dom_html, "lxml")
-
-        # forms from Playwright heuristic first
-        page_forms: List[Dict[str, str]] = []
-        for jf in js_forms:
-            action = jf.get("action") or url
-            method = (jf.get("method") or "get").lower()
-            inputs = jf.get("inputs") or {}
-            if inputs:
-                page_forms.append({"action": action, "method": method, "inputs": inputs})
+        # HTML parsing is CPU-bound; keep it off the event loop
+        static_forms, static_links = await loop.run_in_executor(None, _parse_dom, dom_html, url)
 
-        # then parse static forms
-        for form in soup.find_all("form"):
-            method = (form.get("method") or "get").lower()
-            action = form.get("action") or url
-            action = urlparse.urljoin(url, action)
-            inputs = {}
-            for inp in form.find_all(["input", "textarea", "select"]):
-                name = (inp.get("name")
-                        or inp.get("formcontrolname")
-                        or inp.get("ng-reflect-name")
-                        or inp.get("ng-reflect-form-control-name")
-                        or inp.get("aria-label")
-                        or inp.get("placeholder"))
-                if not name:
-                    continue
-                value = inp.get("value") or ""
-                if inp.name.lower() == "select":
-                    opt = inp.find("option", selected=True) or inp.find("option")
-                    if opt:
-                        value = opt.get("value") or (opt.text or "")
-                inputs[str(name)] = value
-            if inputs:
-                page_forms.append({"action": action, "method": method, "inputs": inputs})
+        # forms from Playwright heuristic first, then static forms
+        add_page_forms(forms, form_pages, url, js_page_forms(js_forms, url) + static_forms)
 
-        if page_forms:
-            forms[url] = page_forms
-
-        # collect links
-        link_candidates: List[str] = []
-        if js_links:
-            link_candidates.extend(js_links)
-        for a in soup.find_all("a", href=True):
-            link_candidates.append(urlparse.urljoin(url, a["href"]))
-        for a in soup.find_all(href=True):
-            href = a.get("href")
-            if href and href.startswith("#"):
-                base = url.split("#", 1)[0]
-                link_candidates.append(base + href)
+        link_candidates: List[str] = list(js_links) + static_links
 
         seen_local: Set[str] = set()
         for href in link_candidates:
             if not href:
                 continue
-            cand = canonicalize_spa(href, start_origin, start_path)
-            ckey = canonical_key(cand)
+            cand, ckey = canonicalize(href)
             if ckey in seen_local or ckey in visited_keys:
                 continue
             seen_local.add(ckey)
@@ -351,127 +658,193 @@ def crawl(start_url: str,
                 continue
             if same_host_only and not same_host(start_url, cand):
                 continue
-            q.put((cand, depth + 1))
-
-        if delay_ms:
-            time.sleep(delay_ms / 1000.0)
+            q.put_nowait((cand, depth + 1))
 
-    if js_browser_ctx is not None:
+    async def worker() -> None:
+        while True:
+            url, depth = await q.get()
+            try:
+                await visit(url, depth)
+            except Exception as e:
+                log.debug("Crawl error for %s: %s", url, e.__class__.__name__)
+            finally:
+                q.task_done()
+
+    q: asyncio.Queue = asyncio.Queue()
+    q.put_nowait((start_url, 0))
+    workers = [asyncio.create_task(worker()) for _ in range(max(1, concurrency))]
+    try:
+        await q.join()
+    finally:
+        for w in workers:
+            w.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+        # cookies set while crawling (sessions, CSRF) must reach the probes
+        session.cookies.update(http.cookies)
+        await http.aclose()
         try:
-            js_browser_ctx.__exit__(None, None, None)
+            await js_stack.aclose()
         except Exception:
             pass
 
-    return pages, forms
+    return pages, forms, headers_map, form_pages
 
 
 # -------------------------
 # Modules: XSS (reflected), SQLi (basic), Headers, DOM-XSS (basic)
 # -------------------------
-def test_reflected_xss(session: requests.Session, url: str, param: str, payloads: List[str], cap: Optional[int] = None) -> Optional[Finding]:
-    tested = 0
-    for p in payloads:
-        if cap is not None and tested >= cap:
-            break
-        tested += 1
+_MIN_REFLECTION_CORE = 6  # shorter alphanumeric cores match too much ordinary text
+# Between core characters allow up to 20 non-alphanumerics or HTML entities.
+# A bare ".{0,20}" backtracks catastrophically on large pages.
+_REFLECTION_UNIT = r"(?:&#?\w+;|[^A-Za-z0-9])"  # one raw or entity-encoded character
+_REFLECTION_GAP = _REFLECTION_UNIT + "{0,20}"
+_HTML_SPECIALS = frozenset("<>\"'")
+
+@lru_cache(maxsize=1024)
+def _reflection_re(payload: str) -> re.Pattern:
+    """
+    One pattern per payload covering both kinds of reflection: group "raw" is
+    the literal payload, group "enc" its alphanumeric core with encoded or
+    stripped characters allowed in between (omitted for short cores). "enc"
+    also takes in as many characters around the core as the payload has, so
+    the match shows how its leading/trailing specials came back.
+    """
+    alts = [f"(?P<raw>{re.escape(payload)})"]
+    core = re.sub(r"[^A-Za-z0-9]", "", payload)
+    if len(core) >= _MIN_REFLECTION_CORE:
+        lead = len(re.match(r"[^A-Za-z0-9]*", payload).group(0))
+        trail = len(re.search(r"[^A-Za-z0-9]*$", payload).group(0))
+        body = _REFLECTION_GAP.join(map(re.escape, core))
+        alts.append(f"(?P<enc>(?i:{_REFLECTION_UNIT}{{0,{lead}}}{body}{_REFLECTION_UNIT}{{0,{trail}}}))")
+    return re.compile("|".join(alts))
+
+def test_reflected_xss(session: httpx.Client, url: str, param: str, payloads: Sequence[EncodedPayload],
+                       cap: Optional[int] = None) -> Optional[Finding]:
+    build = _param_url_builder(url, param)
+    # only a raw reflection ends the loop early; otherwise a later payload may
+    # still come back raw, so keep the most severe encoded match meanwhile
+    encoded: Optional[Finding] = None
+    for p, enc in payloads[:cap]:
         try:
-            parsed = urlparse.urlsplit(url)
-            qs = dict(urlparse.parse_qsl(parsed.query, keep_blank_values=True))
-            qs[param] = p
-            url_mod = urlparse.urlunsplit((parsed.scheme, parsed.netloc, parsed.path, urlparse.urlencode(qs), parsed.fragment))
-            r = session.get(strip_hash(url_mod), timeout=session.request_timeout)
-            if p in (r.text or ""):
+            url_mod, fetch_url = build(enc)
+            r = session.get(fetch_url, timeout=session.request_timeout)
+            text = r.text or ""
+            m = _reflection_re(p).search(text)
+            if m is None:
+                continue
+            # an encoded copy may precede a raw one; the raw reflection wins
+            if m.lastgroup == "raw" or p in text[m.end():]:
                 return Finding("HIGH", "XSS", url_mod, param, f"Reflected payload: {p}")
+            if encoded is not None and encoded.severity == "MEDIUM":
+                continue
+            # a fully encoded echo is only a reflection point, not an injection
+            if not _HTML_SPECIALS.intersection(p).isdisjoint(m.group(0)):
+                encoded = Finding("MEDIUM", "XSS", url_mod, param, f"Payload reflected partly unencoded: {m.group(0)}")
+            elif encoded is None:
+                encoded = Finding("INFO", "XSS", url_mod, param, f"Reflection point (special characters encoded): {m.group(0)}")
         except Exception:
             continue
-    return None
+    return encoded
 
-def test_dom_xss_with_js(url: str, param: str, payloads: List[str], js_cfg: Dict) -> Optional[Finding]:
+def _enter_js_browser(stack: ExitStack, js_cfg: Dict):
+    """Launch one browser on ``stack`` for the scan's DOM-XSS probes; None if Playwright is unavailable."""
     try:
-        from js_renderer import js_context, render_url
+        from js_renderer import js_context
+        return stack.enter_context(js_context(headless=bool(js_cfg.get("headless", True))))
+    except Exception:
+        return None
+
+def test_dom_xss_with_js(browser, url: str, param: str, payloads: Sequence[EncodedPayload], js_cfg: Dict) -> Optional[Finding]:
+    try:
+        from js_renderer import render_url
     except Exception:
         return None
 
-    headless = bool(js_cfg.get("headless", True))
     nav_timeout = int(js_cfg.get("nav_timeout_ms", 12000))
     run_timeout = int(js_cfg.get("run_timeout_ms", 4000))
     max_chars = int(js_cfg.get("max_body_chars", 200000))
 
     CANARY = "XSSCANARY_" + str(int(time.time() * 1000))
     console_canary = f'"><img src=x onerror=console.log("{CANARY}")>'
-    test_values = list(payloads) + [console_canary]
+    test_values = tuple(payloads) + encode_payloads([console_canary])
 
-    from urllib.parse import urlsplit, urlunsplit, urlencode, parse_qsl
-    try:
-        with js_context(headless=headless) as browser:
-            for pld in test_values:
-                try:
-                    parsed = urlsplit(url)
-                    qs = dict(parse_qsl(parsed.query, keep_blank_values=True))
-                    qs[param] = pld
-                    u_mod = urlunsplit((parsed.scheme, parsed.netloc, parsed.path, urlencode(qs), parsed.fragment))
-                    r = render_url(browser, u_mod, nav_timeout, run_timeout, max_chars)
-                    if r.dialogs:
-                        return Finding("HIGH", "XSS", u_mod, param, f"JS dialog triggered: {r.dialogs[0][:80]}")
-                    if any(CANARY in m for m in r.console_messages):
-                        return Finding("HIGH", "XSS", u_mod, param, "Console canary observed (onerror)")
-                    if pld in (r.html or ""):
-                        return Finding("HIGH", "XSS", u_mod, param, "Payload seen in rendered DOM")
-                except Exception:
-                    continue
-    except Exception:
-        return None
+    build = _param_url_builder(url, param)
+    for pld, enc in test_values:
+        try:
+            u_mod, _ = build(enc)
+            r = render_url(browser, u_mod, nav_timeout, run_timeout, max_chars)
+            if r.dialogs:
+                return Finding("HIGH", "XSS", u_mod, param, f"JS dialog triggered: {r.dialogs[0][:80]}")
+            if any(CANARY in m for m in r.console_messages):
+                return Finding("HIGH", "XSS", u_mod, param, "Console canary observed (onerror)")
+            if pld in (r.html or ""):
+                return Finding("HIGH", "XSS", u_mod, param, "Payload seen in rendered DOM")
+        except Exception:
+            continue
     return None
 
-def test_sqli_basic(session: requests.Session, url: str, param: str, payloads: List[str], cap: Optional[int] = None) -> Optional[Finding]:
-    error_signatures = [
-        "you have an error in your sql syntax",
-        "warning: mysql",
-        "unclosed quotation mark",
-        "pg_query():",
-        "mysql_fetch_array()",
-        "sqlstate[",
-        "sqlite_error",
-    ]
-    try:
-        baseline = (session.get(strip_hash(url), timeout=session.request_timeout).text or "")[:5000]
-    except Exception:
-        baseline = ""
+class BaselineCache:
+    """
+    Per-scan cache of baseline response lengths keyed by fetch URL. Probes for
+    several params of one page share a single baseline GET, even when they run
+    concurrently.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures: Dict[str, Future] = {}
+
+    def length(self, session: httpx.Client, url: str) -> Optional[int]:
+        with self._lock:
+            fut = self._futures.get(url)
+            owner = fut is None
+            if owner:
+                fut = self._futures[url] = Future()
+        if owner:
+            try:
+                fut.set_result(len(session.get(url, timeout=session.request_timeout).text or ""))
+            except Exception:
+                fut.set_result(None)
+        return fut.result()
+
+def test_sqli_basic(session: httpx.Client, url: str, param: str, payloads: Sequence[EncodedPayload],
+                    cap: Optional[int] = None, baselines: Optional[BaselineCache] = None) -> Optional[Finding]:
+    baseline_len = (baselines or BaselineCache()).length(session, strip_hash(url))
 
-    tested = 0
-    for p in payloads:
-        if cap is not None and tested >= cap:
-            break
-        tested += 1
+    build = _param_url_builder(url, param)
+    for p, enc in payloads[:cap]:
         try:
-            parsed = urlparse.urlsplit(url)
-            qs = dict(urlparse.parse_qsl(parsed.query, keep_blank_values=True))
-            qs[param] = p
-            url_mod = urlparse.urlunsplit((parsed.scheme, parsed.netloc, parsed.path, urlparse.urlencode(qs), parsed.fragment))
-            r = session.get(strip_hash(url_mod), timeout=session.request_timeout)
-            body = (r.text or "")[:5000].lower()
-            if any(sig in body for sig in error_signatures):
+            url_mod, fetch_url = build(enc)
+            r = session.get(fetch_url, timeout=session.request_timeout)
+            if _SQLI_ERROR_RE.search(r.text or ""):
                 return Finding("HIGH", "SQLi", url_mod, param, f"Error-based signature with payload: {p}")
-            if baseline and abs(len(r.text or "") - len(baseline)) > 500:
+            if baseline_len and abs(len(r.text or "") - baseline_len) > 500:
                 return Finding("MEDIUM", "SQLi", url_mod, param, f"Response length changed with payload: {p}")
         except Exception:
             continue
     return None
 
-def check_security_headers(resp: requests.Response, required: List[str]) -> List[Finding]:
-    f: List[Finding] = []
-    headers = {k.lower(): v for k, v in resp.headers.items()}
-    for h in required:
-        if h.lower() not in headers:
-            f.append(Finding("INFO", "Headers", resp.url, "-", f"Missing header: {h}"))
-    if "strict-transport-security" not in headers and str(resp.url).startswith("https://"):
-        f.append(Finding("INFO", "Headers", resp.url, "-", "No HSTS header"))
+def check_security_headers(url: str, headers: Dict[str, str], required: List[str],
+                           required_lower: Optional[Sequence[str]] = None) -> List[Finding]:
+    """`required_lower` lets callers checking many URLs lowercase `required` once."""
+    if required_lower is None:
+        required_lower = [h.lower() for h in required]
+    present = {k.lower() for k in headers}
+    f = [Finding("INFO", "Headers", url, "-", f"Missing header: {h}")
+         for h, hl in zip(required, required_lower) if hl not in present]
+    if "strict-transport-security" not in present and url.startswith("https://"):
+        f.append(Finding("INFO", "Headers", url, "-", "No HSTS header"))
     return f
 
 
 # -------------------------
 # Orchestrate scan
 # -------------------------
+def _result_or_none(fut: Future) -> Optional[Finding]:
+    try:
+        return fut.result()
+    except Exception:
+        return None
+
 def run_scan(target: str, cfg: Dict) -> ScanResult:
     scan_start = time.time()
 
@@ -500,12 +873,17 @@ def run_scan(target: str, cfg: Dict) -> ScanResult:
     if per_param_cap is not None:
         xss_payloads = xss_payloads[:per_param_cap]
         sqli_payloads = sqli_payloads[:per_param_cap]
+    # shared, immutable (payload, encoded) pairs for every probe
+    xss_encoded = encode_payloads(xss_payloads)
+    sqli_encoded = encode_payloads(sqli_payloads)
 
     # Enforce same_host_only unless explicitly allowed by safety.flag
     same_host_only_cfg = bool(s_cfg.get("same_host_only", True))
     if not same_host_only_cfg and not cfg.get("safety", {}).get("allow_global_scan_flag", False):
         same_host_only_cfg = True
 
+    probe_workers = max(1, int(s_cfg.get("probe_workers", 16)))
+    proxies = s_cfg.get("proxies") or {}
     session = make_session(
         user_agent=s_cfg.get("user_agent", "MiniOWASP/1.1 (+https://github.com/salmanel/owasp-tester)"),
         follow_redirects=bool(s_cfg.get("follow_redirects", True)),
@@ -513,12 +891,10 @@ def run_scan(target: str, cfg: Dict) -> ScanResult:
         verify_ssl=bool(s_cfg.get("verify_ssl", True)),
         retries=int(s_cfg.get("retries", 1)),
         backoff_factor=float(s_cfg.get("backoff_factor", 0.25)),
+        pool_maxsize=probe_workers,
+        proxies=proxies if isinstance(proxies, dict) else None,
     )
 
-    proxies = s_cfg.get("proxies") or {}
-    if isinstance(proxies, dict) and proxies:
-        session.proxies.update(proxies)
-
     auth_cfg = s_cfg.get("auth", {}) or {}
     if auth_cfg.get("enabled"):
         typ = (auth_cfg.get("type") or "").lower().strip()
@@ -530,59 +906,77 @@ def run_scan(target: str, cfg: Dict) -> ScanResult:
             if token:
                 session.headers["Authorization"] = f"Bearer {token}"
 
-    pages, forms = crawl(
-        start_url=target,
-        session=session,
-        max_depth=int(s_cfg.get("max_depth", 2)),
-        same_host_only=same_host_only_cfg,
-        excludes_paths=excl_paths,
-        exclude_domains=excl_domains,
-        follow_redirect_hosts=bool(s_cfg.get("follow_redirect_hosts", False)),
-        allowed_hosts=s_cfg.get("allowed_hosts", []),
-        max_pages=int(s_cfg.get("max_pages", 100)),
-        delay_ms=int(s_cfg.get("delay_ms", 250)),
-        js_cfg=js_cfg,
-    )
-
-    findings: List[Finding] = []
-
-    # Header checks for unique base URLs (no hash)
-    base_urls: Set[str] = set(strip_hash(u) for u in pages)
-    for u in sorted(base_urls):
-        try:
-            r = session.get(u, timeout=session.request_timeout)
-            findings.extend(check_security_headers(r, required_headers))
-        except Exception:
-            pass
-
-    js_enabled = bool(js_cfg.get("enabled", False))
-
-    # GET param tests (XSS + SQLi) for URLs with queries
-    for u in pages:
-        try:
-            parsed = urlparse.urlsplit(u)
-            qs = dict(urlparse.parse_qsl(parsed.query, keep_blank_values=True))
-            if not qs:
+    # entered before the first request; closes pooled connections when done
+    with session:
+        pages, forms, headers_map, form_pages = asyncio.run(crawl(
+            start_url=target,
+            session=session,
+            max_depth=int(s_cfg.get("max_depth", 2)),
+            same_host_only=same_host_only_cfg,
+            excludes_paths=excl_paths,
+            exclude_domains=excl_domains,
+            follow_redirect_hosts=bool(s_cfg.get("follow_redirect_hosts", False)),
+            allowed_hosts=s_cfg.get("allowed_hosts", []),
+            max_pages=int(s_cfg.get("max_pages", 100)),
+            delay_ms=int(s_cfg.get("delay_ms", 250)),
+            js_cfg=js_cfg,
+            concurrency=int(s_cfg.get("crawl_concurrency", 20)),
+        ))
+
+        findings: List[Finding] = []
+
+        # Header checks reuse the responses the crawler already fetched
+        required_lower = tuple(h.lower() for h in required_headers)
+        for u in sorted(headers_map):
+            findings.extend(check_security_headers(u, headers_map[u], required_headers, required_lower))
+
+        js_enabled = bool(js_cfg.get("enabled", False))
+
+        # GET param tests (XSS + SQLi) for URLs with queries; a "?" scan skips
+        # parsing static pages altogether
+        param_map: Dict[str, List[str]] = {}
+        for u in pages:
+            if "?" not in u:
                 continue
-
-            # XSS
-            for param in qs:
-                fx = test_reflected_xss(session, u, param, xss_payloads, per_param_cap)
-                if fx:
-                    findings.append(fx)
-                    continue
-                if js_enabled:
-                    fdom = test_dom_xss_with_js(u, param, xss_payloads, js_cfg)
-                    if fdom:
-                        findings.append(fdom)
-
-            # SQLi
-            for param in qs:
-                fs = test_sqli_basic(session, u, param, sqli_payloads, per_param_cap)
-                if fs:
-                    findings.append(fs)
-        except Exception:
-            pass
+            try:
+                qs = dict(urlparse.parse_qsl(urlparse.urlsplit(u).query, keep_blank_values=True))
+            except Exception:
+                continue
+            if qs:
+                param_map[u] = list(qs)
+
+        # Each probe is an independent chain of HTTP round-trips, so reflected XSS
+        # and SQLi probes for every (url, param) run on a thread pool. Results are
+        # read back in page/param order, keeping the findings order deterministic.
+        # DOM-XSS probes share one browser, launched once for the whole loop.
+        with ExitStack() as stack, ThreadPoolExecutor(max_workers=probe_workers, thread_name_prefix="probe") as pool:
+            dom_browser = _enter_js_browser(stack, js_cfg) if js_enabled and param_map else None
+            xss_futs = {(u, param): pool.submit(test_reflected_xss, session, u, param, xss_encoded, per_param_cap)
+                        for u, params in param_map.items() for param in params}
+            baselines = BaselineCache()
+            sqli_futs = {(u, param): pool.submit(test_sqli_basic, session, u, param, sqli_encoded, per_param_cap, baselines)
+                         for u, params in param_map.items() for param in params}
+
+            for u, params in param_map.items():
+                # XSS
+                for param in params:
+                    fx = _result_or_none(xss_futs[(u, param)])
+                    if fx:
+                        findings.append(fx)
+                        # pages that escape server-side may still have a DOM sink
+                        if fx.severity == "HIGH":
+                            continue
+                    if dom_browser is not None:
+                        # Playwright-driven; stays on this thread
+                        fdom = test_dom_xss_with_js(dom_browser, u, param, xss_encoded, js_cfg)
+                        if fdom:
+                            findings.append(fdom)
+
+                # SQLi
+                for param in params:
+                    fs = _result_or_none(sqli_futs[(u, param)])
+                    if fs:
+                        findings.append(fs)
 
     total_forms = sum(len(v) for v in forms.values())
 
@@ -596,6 +990,7 @@ def run_scan(target: str, cfg: Dict) -> ScanResult:
         findings=findings,
         started_at=scan_start,
         finished_at=scan_end,
+        form_pages=form_pages,
     )
 
 
@@ -615,29 +1010,26 @@ def save_report(result: ScanResult, out_dir: str, report_cfg: Optional[Dict] = N
 
     if want_json:
         json_path = base + ".json"
-        with open(json_path, "w", encoding="utf-8") as f:
-            json.dump({
+        with open(json_path, "wb") as f:
+            f.write(orjson.dumps({
                 "target": result.target,
                 "pages": result.pages,
                 "forms": result.forms,
                 "crawled_pages": result.crawled_pages,
                 "discovered_forms": result.discovered_forms,
-                "findings": [asdict(x) for x in result.findings],
+                "findings": result.findings,
                 "started_at": result.started_at,
                 "finished_at": result.finished_at,
-            }, f, indent=2)
+                "form_pages": result.form_pages,
+            }, option=orjson.OPT_INDENT_2))
 
     if want_html:
-        rows = []
-        for fnd in result.findings:
-            rows.append(
-                f"<tr><td>{html.escape(fnd.severity)}</td>"
-                f"<td>{html.escape(fnd.category)}</td>"
-                f"<td>{html.escape(fnd.url)}</td>"
-                f"<td>{html.escape(fnd.param)}</td>"
-                f"<td>{html.escape(fnd.evidence)}</td></tr>"
-            )
-        table = "\n".join(rows) or "<tr><td colspan='5'>No findings 🎉</td></tr>"
+        esc = html.escape
+        table = "\n".join(
+            f"<tr><td>{esc(fnd.severity)}</td><td>{esc(fnd.category)}</td><td>{esc(fnd.url)}</td>"
+            f"<td>{esc(fnd.param)}</td><td>{esc(fnd.evidence)}</td></tr>"
+            for fnd in result.findings
+        ) or "<tr><td colspan='5'>No findings 🎉</td></tr>"
 
         forms_html_parts: List[str] = []
         if result.forms:
@@ -652,7 +1044,9 @@ def save_report(result: ScanResult, out_dir: str, report_cfg: Optional[Dict] = N
                     action = html.escape(fm.get('action') or page)
                     inputs = fm.get('inputs') or {}
                     kvs = ", ".join(f"{html.escape(str(k))}" for k in inputs.keys()) if inputs else "(no inputs)"
-                    forms_html_parts.append(f"<li><strong>{method}</strong> {action} &nbsp; <em>inputs:</em> {kvs}</li>")
+                    seen_on = len(result.form_pages.get(fm.get('signature'), ()))
+                    also = f" &nbsp; <em>(on {seen_on} pages)</em>" if seen_on > 1 else ""
+                    forms_html_parts.append(f"<li><strong>{method}</strong> {action} &nbsp; <em>inputs:</em> {kvs}{also}</li>")
                 forms_html_parts.append("</ul>")
         else:
             forms_html_parts.append("<p><em>No forms discovered.</em></p>")
@@ -697,7 +1091,6 @@ code, pre{{background:#f7f7f7; padding:2px 4px}}
 # Pretty helpers
 # -------------------------
 def summary_text(result: ScanResult) -> str:
-    high = sum(1 for f in result.findings if f.severity == "HIGH")
-    med  = sum(1 for f in result.findings if f.severity == "MEDIUM")
-    info = sum(1 for f in result.findings if f.severity in ("LOW", "INFO"))
-    return f"Pages: {result.crawled_pages} | Forms: {result.discovered_forms} | HIGH: {high} | MEDIUM: {med} | INFO: {info}"
+    sev = Counter(f.severity for f in result.findings)
+    return (f"Pages: {result.crawled_pages} | Forms: {result.discovered_forms} | "
+            f"HIGH: {sev['HIGH']} | MEDIUM: {sev['MEDIUM']} | INFO: {sev['LOW'] + sev['INFO']}")